@@ -13,7 +13,7 @@ from instagrapi.exceptions import (
 )
 
 from models import User
-from .session import save_session, load_session
+from .session import save_session, load_session, session_lock
 from .parsers import parse_user
 
 logger = logging.getLogger(__name__)
@@ -28,7 +28,21 @@ def login(
     Login to Instagram. Returns (success, error_message, user).
 
     Tries to restore session first, then fresh login if needed.
+
+    Runs under the session file lock, so concurrent workers log in one at a
+    time: the first does the fresh login and saves the session, and the
+    rest restore it instead of logging in again.
     """
+    with session_lock():
+        return _login_locked(client, username, password)
+
+
+def _login_locked(
+    client: Client,
+    username: str,
+    password: str
+) -> tuple[bool, Optional[str], Optional[User]]:
+    """login() body; the caller holds session_lock()"""
     # Try to restore existing session
     if load_session(client):
         try:
@@ -1,8 +1,13 @@
 """Main Instagram client class"""
 
 import logging
+import socket
+import threading
 from typing import Optional
 
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
 from instagrapi import Client
 
 from models import (
@@ -15,6 +20,7 @@ from .session import delete_session
 from .auth import login as auth_login
 from .messages import (
     get_inbox as msg_get_inbox,
+    get_inbox_with_messages as msg_get_inbox_with_messages,
     get_thread as msg_get_thread,
     send_message as msg_send_message,
     send_message_to_user as msg_send_message_to_user,
@@ -24,16 +30,59 @@ from .messages import (
 logger = logging.getLogger(__name__)
 
 
+class _KeepAliveAdapter(HTTPAdapter):
+    """HTTPAdapter that enables TCP keepalive on pooled connections"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs["socket_options"] = HTTPConnection.default_socket_options + [
+            (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+        ]
+        super().init_poolmanager(*args, **kwargs)
+
+
+def _tune_connection_pool(session: requests.Session) -> None:
+    """
+    Replace plain HTTPAdapters on an instagrapi session with pooled keepalive ones.
+
+    Keeps the adapter's retry settings. Other adapters (e.g. instagrapi's
+    HTTP/2 curl transport) already reuse connections and are left alone.
+    """
+    replaced: dict[int, HTTPAdapter] = {}
+    for prefix, adapter in list(session.adapters.items()):
+        if type(adapter) is not HTTPAdapter:
+            continue
+        if id(adapter) not in replaced:
+            replaced[id(adapter)] = _KeepAliveAdapter(
+                pool_connections=10,
+                pool_maxsize=20,
+                pool_block=False,
+                max_retries=adapter.max_retries,
+            )
+            adapter.close()
+        session.mount(prefix, replaced[id(adapter)])
+
+
+def _new_client() -> Client:
+    """Create an instagrapi Client with our request settings"""
+    client = Client()
+    client.delay_range = [1, 3]  # Add delay between requests
+    _tune_connection_pool(client.private)
+    _tune_connection_pool(client.public)
+    return client
+
+
 class InstagramClient:
     """
     Wrapper around instagrapi.Client with session persistence
     and clean response formatting.
     """
 
-    def __init__(self):
-        self.client = Client()
-        self.client.delay_range = [1, 3]  # Add delay between requests
+    def __init__(self) -> None:
+        self.client = _new_client()
         self._logged_in_user: Optional[User] = None
+        # login() runs on a worker thread; serializes it with logout() so a
+        # logout can't swap self.client out from under an in-flight login
+        self._auth_lock = threading.Lock()
 
     # ========================================================================
     # Authentication
@@ -45,16 +94,18 @@ class InstagramClient:
 
         Tries to restore session first, then fresh login if needed.
         """
-        success, error, user = auth_login(self.client, username, password)
-        if success:
-            self._logged_in_user = user
-        return success, error
+        with self._auth_lock:
+            success, error, user = auth_login(self.client, username, password)
+            if success:
+                self._logged_in_user = user
+            return success, error
 
     def logout(self) -> None:
-        """Logout and clear session"""
-        delete_session()
-        self.client = Client()
-        self._logged_in_user = None
+        """Logout and clear session. Blocks while a login is in progress."""
+        with self._auth_lock:
+            delete_session()
+            self.client = _new_client()
+            self._logged_in_user = None
         logger.info("Logged out")
 
     def is_authenticated(self) -> bool:
@@ -69,10 +120,18 @@ class InstagramClient:
     # Direct Messages
     # ========================================================================
 
-    def get_inbox(self, amount: int = 20) -> list[DirectThreadPreview]:
-        """Get DM inbox (list of threads)."""
+    def get_inbox(self, amount: int = 20) -> tuple[DirectThreadPreview, ...]:
+        """Get DM inbox (list of thread previews)."""
         return msg_get_inbox(self.client, self._logged_in_user, amount)
 
+    def get_inbox_with_messages(
+        self, amount: int = 20, message_limit: int = 5
+    ) -> tuple[DirectThread, ...]:
+        """Get DM inbox as threads with their most recent messages."""
+        return msg_get_inbox_with_messages(
+            self.client, self._logged_in_user, amount, message_limit
+        )
+
     def get_thread(self, thread_id: str, amount: int = 20) -> DirectThread:
         """Get a thread with its messages."""
         return msg_get_thread(self.client, self._logged_in_user, thread_id, amount)
@@ -1,6 +1,7 @@
 """Direct message operations for Instagram client"""
 
 import logging
+import time
 from typing import Optional
 
 from instagrapi import Client
@@ -8,6 +9,7 @@ from instagrapi.exceptions import LoginRequired
 
 from models import (
     User,
+    UserShort,
     DirectMessage,
     DirectThread,
     DirectThreadPreview,
@@ -16,12 +18,16 @@ from .parsers import parse_user, parse_message, parse_thread, parse_thread_previ
 
 logger = logging.getLogger(__name__)
 
+# username -> (user_id, cached_at) for repeat sends to the same user
+USER_ID_CACHE_TTL = 3600  # seconds
+_username_to_id: dict[str, tuple[str, float]] = {}
+
 
 def get_inbox(
     client: Client,
     logged_in_user: Optional[User],
     amount: int = 20
-) -> list[DirectThreadPreview]:
+) -> tuple[DirectThreadPreview, ...]:
     """
     Get DM inbox (list of threads).
 
@@ -36,8 +42,43 @@ def get_inbox(
     if not logged_in_user:
         raise LoginRequired("Not logged in")
 
-    threads = client.direct_threads(amount=amount)
-    return [parse_thread_preview(t) for t in threads]
+    # Participants repeat across threads; share one UserShort per user
+    user_cache: dict[str, UserShort] = {}
+
+    # The preview only shows the latest message, so don't fetch more
+    threads = client.direct_threads(amount=amount, thread_message_limit=1)
+    _parse_thread_preview = parse_thread_preview
+    return tuple([_parse_thread_preview(t, user_cache) for t in threads])
+
+
+def get_inbox_with_messages(
+    client: Client,
+    logged_in_user: Optional[User],
+    amount: int = 20,
+    message_limit: int = 5
+) -> tuple[DirectThread, ...]:
+    """
+    Get DM inbox as full threads, each with its most recent messages.
+
+    Args:
+        client: Instagram client
+        logged_in_user: Currently logged in user
+        amount: Number of threads to fetch (default 20)
+        message_limit: Number of recent messages per thread (default 5)
+
+    Returns:
+        List of threads with messages
+    """
+    if not logged_in_user:
+        raise LoginRequired("Not logged in")
+
+    # Participants repeat across threads; share one UserShort per user
+    user_cache: dict[str, UserShort] = {}
+
+    threads = client.direct_threads(amount=amount, thread_message_limit=message_limit)
+    _parse_thread = parse_thread
+    logged_in_user_pk = logged_in_user.pk
+    return tuple([_parse_thread(t, logged_in_user_pk, user_cache) for t in threads])
 
 
 def get_thread(
@@ -112,14 +153,25 @@ def send_message_to_user(
     if not logged_in_user:
         raise LoginRequired("Not logged in")
 
-    # Get user ID from username
-    user_id = client.user_id_from_username(username)
+    user_id = _user_id_from_username(client, username)
 
     # Send message
     result = client.direct_send(text=text, user_ids=[user_id])
     return parse_message(result, logged_in_user.pk)
 
 
+def _user_id_from_username(client: Client, username: str) -> str:
+    """Get user ID from username, cached for USER_ID_CACHE_TTL seconds"""
+    now = time.monotonic()
+    cached = _username_to_id.get(username)
+    if cached and now - cached[1] < USER_ID_CACHE_TTL:
+        return cached[0]
+
+    user_id = client.user_id_from_username(username)
+    _username_to_id[username] = (user_id, now)
+    return user_id
+
+
 def search_user(
     client: Client,
     logged_in_user: Optional[User],
@@ -1,47 +1,98 @@
-"""Parsing helpers - convert instagrapi types to our Pydantic models"""
+"""Parsing helpers - convert instagrapi types to our Pydantic models
+
+The data here comes straight from instagrapi and is already typed, so the
+models are built with from_trusted() (no validation). Every field is
+passed explicitly and coerced to the declared type where needed.
+
+This module is fully annotated so it can be compiled with mypyc
+(see README); the pure-Python version is used when it isn't.
+"""
+
+from typing import Any, Optional, Union
 
 from instagrapi.types import (
+    Account as IGAccount,
     DirectThread as IGDirectThread,
     DirectMessage as IGDirectMessage,
+    User as IGUser,
+    UserShort as IGUserShort,
 )
 
 from models import (
     User,
     UserShort,
+    Reaction,
     DirectMessage,
     DirectThread,
     DirectThreadPreview,
 )
 
+def _s(value: Any) -> str:
+    """str() that skips the conversion when instagrapi already gave us a str"""
+    return value if type(value) is str else str(value)
+
 
-def parse_user(user) -> User:
+# Preview text for non-text messages in the inbox
+_TYPE_PREVIEWS = {
+    "media": "Photo",
+    "video": "Video",
+    "reel_share": "Shared Reel",
+    "story_share": "Shared Story",
+    "media_share": "Shared Post",
+    "voice_media": "Voice Message",
+    "animated_media": "GIF",
+    "link": "Link",
+    "like": "Liked",
+}
+
+
+def parse_user(user: Union[IGUser, IGAccount]) -> User:
     """Convert instagrapi user to our User model"""
-    return User(
-        pk=str(user.pk),
-        username=user.username,
+    return User.from_trusted(
+        pk=_s(user.pk),
+        username=user.username or "",
         full_name=user.full_name or "",
-        profile_pic_url=str(user.profile_pic_url) if user.profile_pic_url else None,
+        profile_pic_url=str(user.profile_pic_url) if user.profile_pic_url else "",
         is_private=getattr(user, 'is_private', False),
         is_verified=getattr(user, 'is_verified', False),
     )
 
 
-def parse_user_short(user) -> UserShort:
+def parse_user_short(user: IGUserShort) -> UserShort:
     """Convert instagrapi user to our UserShort model"""
-    return UserShort(
-        pk=str(user.pk),
-        username=user.username,
+    return UserShort.from_trusted(
+        pk=_s(user.pk),
+        # Optional on instagrapi's UserShort, but the CLI expects a string
+        username=user.username or "",
         full_name=user.full_name or "",
-        profile_pic_url=str(user.profile_pic_url) if user.profile_pic_url else None,
+        profile_pic_url=str(user.profile_pic_url) if user.profile_pic_url else "",
     )
 
 
+def parse_reactions(msg: IGDirectMessage) -> tuple[Reaction, ...]:
+    """Convert instagrapi message reactions to our Reaction models"""
+    reactions = getattr(msg, 'reactions', None)
+    if not reactions or not reactions.emojis:
+        return ()
+
+    return tuple([
+        Reaction.from_trusted(
+            user_id=_s(r.sender_id),
+            emoji=r.emoji,
+            timestamp=r.timestamp,
+        )
+        for r in reactions.emojis
+    ])
+
+
 def parse_message(msg: IGDirectMessage, logged_in_user_pk: str | None = None) -> DirectMessage:
     """Convert instagrapi DirectMessage to our model"""
+    # instagrapi user IDs are already strings, so compare them as-is
+    sender_id = msg.user_id
+    user_id = _s(sender_id) if sender_id else None
+
     # Determine if sent by viewer
-    is_sent_by_viewer = False
-    if logged_in_user_pk and msg.user_id:
-        is_sent_by_viewer = str(msg.user_id) == logged_in_user_pk
+    is_sent_by_viewer = user_id is not None and user_id == logged_in_user_pk
 
     # Extract media info if present
     media_url = None
@@ -57,9 +108,9 @@ def parse_message(msg: IGDirectMessage, logged_in_user_pk: str | None = None) ->
         link_url = getattr(msg.link, 'url', None)
         link_title = getattr(msg.link, 'title', None)
 
-    return DirectMessage(
-        id=str(msg.id),
-        user_id=str(msg.user_id) if msg.user_id else None,
+    return DirectMessage.from_trusted(
+        id=_s(msg.id),
+        user_id=user_id,
         timestamp=msg.timestamp,
         item_type=msg.item_type or "unknown",
         text=msg.text,
@@ -68,50 +119,104 @@ def parse_message(msg: IGDirectMessage, logged_in_user_pk: str | None = None) ->
         media_type=media_type,
         link_url=link_url,
         link_title=link_title,
+        reactions=parse_reactions(msg),
     )
 
 
-def parse_thread(thread: IGDirectThread, logged_in_user_pk: str | None = None) -> DirectThread:
+def parse_thread_users(
+    ig_users: list[IGUserShort],
+    user_cache: Optional[dict[str, UserShort]] = None
+) -> tuple[UserShort, ...]:
+    """
+    Convert thread participants, reusing UserShort instances from user_cache.
+
+    Models are frozen, so one instance per user can be shared by every
+    thread that user appears in (within a single request).
+    """
+    _parse_user_short = parse_user_short
+    if user_cache is None:
+        return tuple([_parse_user_short(u) for u in ig_users])
+
+    users = []
+    for u in ig_users:
+        pk = _s(u.pk)
+        user = user_cache.get(pk)
+        if user is None:
+            user = user_cache[pk] = _parse_user_short(u)
+        users.append(user)
+    return tuple(users)
+
+
+def parse_thread(
+    thread: IGDirectThread,
+    logged_in_user_pk: str | None = None,
+    user_cache: Optional[dict[str, UserShort]] = None
+) -> DirectThread:
     """Convert instagrapi DirectThread to our model (with messages)"""
-    users = [parse_user_short(u) for u in thread.users]
-    messages = [parse_message(m, logged_in_user_pk) for m in (thread.messages or [])]
+    # Read each thread attribute once
+    last_activity = getattr(thread, 'last_activity_at', None)
+    is_group_attr = getattr(thread, 'is_group', None)
+    muted = getattr(thread, 'muted', False)
+    has_newer = getattr(thread, 'has_newer', False)
+    thread_messages = thread.messages
+
+    # Bind parser locally for the per-message loop
+    _parse_message = parse_message
+
+    users = parse_thread_users(thread.users, user_cache)
+    messages = tuple([_parse_message(m, logged_in_user_pk) for m in (thread_messages or ())])
 
     # Build thread title from usernames if not set
     thread_title = thread.thread_title or ""
     if not thread_title and users:
-        thread_title = ", ".join(u.username for u in users)
+        thread_title = ", ".join([u.username for u in users if u.username])
 
-    return DirectThread(
-        id=str(thread.id),
-        pk=str(thread.pk),
+    return DirectThread.from_trusted(
+        id=_s(thread.id),
+        pk=_s(thread.pk),
         thread_title=thread_title,
         users=users,
-        last_activity_at=getattr(thread, 'last_activity_at', None),
-        is_group=thread.is_group if hasattr(thread, 'is_group') else len(users) > 1,
-        is_muted=getattr(thread, 'muted', False),
-        has_unread=getattr(thread, 'has_newer', False),
+        last_activity_at=last_activity,
+        is_group=is_group_attr if is_group_attr is not None else len(users) > 1,
+        is_muted=muted,
+        has_unread=has_newer,
+        last_message=None,
         messages=messages,
     )
 
 
-def parse_thread_preview(thread: IGDirectThread) -> DirectThreadPreview:
+def parse_thread_preview(
+    thread: IGDirectThread,
+    user_cache: Optional[dict[str, UserShort]] = None
+) -> DirectThreadPreview:
     """Convert instagrapi DirectThread to our preview model (for inbox)"""
-    users = [parse_user_short(u) for u in thread.users]
+    # Read each thread attribute once
+    last_activity = getattr(thread, 'last_activity_at', None)
+    is_group_attr = getattr(thread, 'is_group', None)
+    muted = getattr(thread, 'muted', False)
+    has_newer = getattr(thread, 'has_newer', False)
+    thread_messages = thread.messages
+
+    users = parse_thread_users(thread.users, user_cache)
 
     # Build thread title from usernames if not set
     thread_title = thread.thread_title or ""
     if not thread_title and users:
-        thread_title = ", ".join(u.username for u in users)
+        thread_title = ", ".join([u.username for u in users if u.username])
 
     # Get last message info
     last_msg_text = None
     last_msg_type = None
     # Use last_activity_at as primary timestamp (more reliable for inbox)
     # Fall back to message timestamp if available
-    last_msg_timestamp = getattr(thread, 'last_activity_at', None)
+    last_msg_timestamp = last_activity
+
+    try:
+        last_msg = thread_messages[0]
+    except (IndexError, TypeError):
+        last_msg = None
 
-    if thread.messages:
-        last_msg = thread.messages[0]
+    if last_msg is not None:
         last_msg_type = last_msg.item_type or "unknown"
         # Use message timestamp if last_activity_at not available
         if not last_msg_timestamp:
@@ -121,28 +226,17 @@ def parse_thread_preview(thread: IGDirectThread) -> DirectThreadPreview:
             last_msg_text = last_msg.text
         else:
             # Generate preview for non-text messages
-            type_previews = {
-                "media": "Photo",
-                "video": "Video",
-                "reel_share": "Shared Reel",
-                "story_share": "Shared Story",
-                "media_share": "Shared Post",
-                "voice_media": "Voice Message",
-                "animated_media": "GIF",
-                "link": "Link",
-                "like": "Liked",
-            }
-            last_msg_text = type_previews.get(last_msg_type, f"[{last_msg_type}]")
-
-    return DirectThreadPreview(
-        id=str(thread.id),
-        pk=str(thread.pk),
+            last_msg_text = _TYPE_PREVIEWS.get(last_msg_type, f"[{last_msg_type}]")
+
+    return DirectThreadPreview.from_trusted(
+        id=_s(thread.id),
+        pk=_s(thread.pk),
         thread_title=thread_title,
         users=users,
-        last_activity_at=getattr(thread, 'last_activity_at', None),
-        is_group=thread.is_group if hasattr(thread, 'is_group') else len(users) > 1,
-        is_muted=getattr(thread, 'muted', False),
-        has_unread=getattr(thread, 'has_newer', False),
+        last_activity_at=last_activity,
+        is_group=is_group_attr if is_group_attr is not None else len(users) > 1,
+        is_muted=muted,
+        has_unread=has_newer,
         last_message_text=last_msg_text,
         last_message_type=last_msg_type,
         last_message_timestamp=last_msg_timestamp,
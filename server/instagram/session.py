@@ -1,17 +1,48 @@
 """Session management for Instagram client"""
 
 import logging
+from contextlib import contextmanager
 from pathlib import Path
+from types import ModuleType
+from typing import Iterator, Optional
+
+fcntl: Optional[ModuleType]
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
 
 from instagrapi import Client
 
 logger = logging.getLogger(__name__)
 
 SESSION_FILE = Path(__file__).parent.parent / ".ig_session.json"
+SESSION_LOCK_PATH = SESSION_FILE.with_name(".ig_session.lock")
+
+
+@contextmanager
+def session_lock() -> Iterator[None]:
+    """
+    Hold an exclusive lock on SESSION_LOCK_PATH across processes (no-op without fcntl).
+
+    Uvicorn workers share SESSION_FILE, so anything that reads or rewrites
+    it must hold this lock. Not reentrant: the helpers below expect the
+    caller to hold it.
+    """
+    if fcntl is None:
+        yield
+        return
+
+    with open(SESSION_LOCK_PATH, "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
 
 
 def save_session(client: Client) -> None:
-    """Save session to disk for reuse"""
+    """Save session to disk for reuse. Call with session_lock() held."""
     try:
         client.dump_settings(SESSION_FILE)
         logger.info("Session saved to %s", SESSION_FILE)
@@ -20,7 +51,7 @@ def save_session(client: Client) -> None:
 
 
 def load_session(client: Client) -> bool:
-    """Load session from disk. Returns True if successful."""
+    """Load session from disk. Returns True if successful. Call with session_lock() held."""
     if not SESSION_FILE.exists():
         logger.info("No saved session found")
         return False
@@ -37,8 +68,9 @@ def load_session(client: Client) -> bool:
 def delete_session() -> None:
     """Delete saved session file"""
     try:
-        if SESSION_FILE.exists():
-            SESSION_FILE.unlink()
-            logger.info("Session file deleted")
+        with session_lock():
+            if SESSION_FILE.exists():
+                SESSION_FILE.unlink()
+                logger.info("Session file deleted")
     except Exception as e:
         logger.warning("Failed to delete session file: %s", e)
@@ -5,16 +5,20 @@ A lightweight API server for Instagram DMs, designed for use with a Rust CLI.
 Uses instagrapi for Instagram communication.
 """
 
+import asyncio
+import hashlib
 import logging
 import os
 from contextlib import asynccontextmanager
+from typing import Optional, Union
 
 from dotenv import load_dotenv
-from fastapi import FastAPI, HTTPException, status
+from fastapi import FastAPI, HTTPException, Query, Request, Response, status
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
 
 # Load environment variables from .env file
 load_dotenv()
-from fastapi.responses import JSONResponse
 from instagrapi.exceptions import LoginRequired
 
 from models import (
@@ -24,13 +28,20 @@ from models import (
     SendMessageRequest,
     SendMessageResponse,
     InboxResponse,
+    InboxWithMessagesResponse,
     ThreadResponse,
     HealthResponse,
     ErrorResponse,
     User,
 )
 from instagram import instagram_client
-from middleware import get_public_key_pem, decrypt_password, ensure_keys_exist
+from responses import ORJSONResponse
+from middleware import (
+    get_public_key_pem,
+    decrypt_password,
+    decrypt_password_hybrid,
+    ensure_keys_exist,
+)
 
 # Configure logging
 logging.basicConfig(
@@ -39,6 +50,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# ETag for /auth/public-key, computed once at startup
+_PUBKEY_ETAG: Optional[str] = None
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -46,15 +60,19 @@ async def lifespan(app: FastAPI):
     Startup and shutdown events.
     Auto-login if credentials are in environment.
     """
-    # Startup - ensure RSA keys exist for encryption
-    ensure_keys_exist()
+    # Startup - ensure RSA keys exist for encryption. Key generation is
+    # CPU-bound, so run it off the event loop.
+    await asyncio.to_thread(ensure_keys_exist)
+
+    global _PUBKEY_ETAG
+    _PUBKEY_ETAG = '"%s"' % hashlib.sha256(get_public_key_pem().encode()).hexdigest()
 
     username = os.getenv("IG_USERNAME")
     password = os.getenv("IG_PASSWORD")
     
     if username and password:
         logger.info("Auto-logging in with environment credentials...")
-        success, error = instagram_client.login(username, password)
+        success, error = await asyncio.to_thread(instagram_client.login, username, password)
         if success:
             logger.info("Auto-login successful")
         else:
@@ -72,17 +90,23 @@ app = FastAPI(
     title="Instagram DM CLI Server",
     description="A lightweight API for Instagram DMs",
     version="0.1.0",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan,
 )
 
 
+# Handlers return ORJSONResponse directly. response_model is kept for the
+# OpenAPI docs, but FastAPI doesn't re-validate or re-serialize a returned
+# Response, so each payload is encoded exactly once.
+
+
 # ============================================================================
 # Error Handlers
 # ============================================================================
 
 @app.exception_handler(LoginRequired)
 async def login_required_handler(request, exc):
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_401_UNAUTHORIZED,
         content={"success": False, "error": "Not logged in"}
     )
@@ -91,7 +115,7 @@ async def login_required_handler(request, exc):
 @app.exception_handler(Exception)
 async def generic_exception_handler(request, exc):
     logger.error("Unhandled exception: %s", exc)
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={"success": False, "error": str(exc)}
     )
@@ -105,11 +129,11 @@ async def generic_exception_handler(request, exc):
 async def health_check():
     """Check server status and authentication state"""
     user = instagram_client.get_current_user()
-    return HealthResponse(
+    return ORJSONResponse(HealthResponse(
         status="ok",
         authenticated=instagram_client.is_authenticated(),
         username=user.username if user else None,
-    )
+    ))
 
 
 # ============================================================================
@@ -117,7 +141,7 @@ async def health_check():
 # ============================================================================
 
 @app.get("/auth/public-key", response_model=PublicKeyResponse, tags=["Auth"])
-async def get_public_key():
+async def get_public_key(request: Request):
     """
     Get the server's RSA public key for encrypting credentials.
 
@@ -125,23 +149,93 @@ async def get_public_key():
     1. Fetch this public key
     2. Encrypt the password using RSA-OAEP with SHA-256
     3. Send the encrypted password (base64 encoded) in the login request
+
+    Or, for hybrid encryption:
+    2. Encrypt the password with a random AES-256-GCM key and 12-byte nonce
+    3. Encrypt the AES key using RSA-OAEP with SHA-256
+    4. Send wrapped_key, nonce and ciphertext (base64 encoded) in the login request
+
+    Responses carry an ETag; send it back in If-None-Match to get a 304.
     """
-    return PublicKeyResponse(public_key=get_public_key_pem())
+    if _PUBKEY_ETAG and request.headers.get("if-none-match") == _PUBKEY_ETAG:
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers={"ETag": _PUBKEY_ETAG},
+        )
+
+    # The key never changes at runtime, so let clients cache it
+    headers = {"Cache-Control": "public, max-age=86400"}
+    if _PUBKEY_ETAG:
+        headers["ETag"] = _PUBKEY_ETAG
+    return ORJSONResponse(
+        PublicKeyResponse(public_key=get_public_key_pem()),
+        headers=headers,
+    )
+
 
+def _is_json_content_type(content_type: str) -> bool:
+    """True for application/json and application/*+json, as FastAPI accepts"""
+    maintype, _, subtype = content_type.partition(";")[0].strip().lower().partition("/")
+    return maintype == "application" and (subtype == "json" or subtype.endswith("+json"))
 
-@app.post("/auth/login", response_model=LoginResponse, tags=["Auth"])
-async def login(request: LoginRequest):
+
+@app.post(
+    "/auth/login",
+    response_model=LoginResponse,
+    tags=["Auth"],
+    # The body is parsed by hand below; document it for /docs
+    openapi_extra={
+        "requestBody": {
+            "content": {"application/json": {"schema": LoginRequest.model_json_schema()}},
+            "required": True,
+        }
+    },
+)
+async def login(raw_request: Request):
     """
     Login to Instagram.
 
     Supports both encrypted and plain text passwords:
-    - encrypted_password: RSA-encrypted password (base64) - recommended
+    - wrapped_key + nonce + ciphertext: AES-GCM encrypted password with
+      RSA-wrapped key (base64) - recommended
+    - encrypted_password: RSA-encrypted password (base64)
     - password: Plain text password (for testing only)
 
     If successful, session is saved and will be restored on server restart.
     """
+    # FastAPI only parses JSON bodies sent as JSON. Keep that check: a
+    # text/plain POST is a "simple" cross-origin request any web page can make.
+    if not _is_json_content_type(raw_request.headers.get("content-type", "")):
+        raise RequestValidationError([{
+            "type": "model_attributes_type",
+            "loc": ("body",),
+            "msg": "Input should be a valid dictionary or object to extract fields from",
+        }])
+
+    # Parse and validate the JSON body in a single pydantic-core pass
+    try:
+        request = LoginRequest.model_validate_json(await raw_request.body())
+    except ValidationError as e:
+        # Body-prefixed locs like FastAPI's, but never echo the input back:
+        # it holds the password
+        raise RequestValidationError([
+            {**{k: v for k, v in err.items() if k != "input"}, "loc": ("body", *err["loc"])}
+            for err in e.errors(include_url=False)
+        ])
+
     # Determine which password to use
-    if request.encrypted_password:
+    if request.wrapped_key:
+        try:
+            password = decrypt_password_hybrid(
+                request.wrapped_key, request.nonce, request.ciphertext
+            )
+            logger.info("Using hybrid-encrypted password for login")
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Failed to decrypt password"
+            )
+    elif request.encrypted_password:
         try:
             password = decrypt_password(request.encrypted_password)
             logger.info("Using encrypted password for login")
@@ -156,17 +250,21 @@ async def login(request: LoginRequest):
     else:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Either password or encrypted_password is required"
+            detail="One of password, encrypted_password or wrapped_key/nonce/ciphertext is required"
         )
 
-    success, error = instagram_client.login(request.username, password)
+    # instagrapi's network calls and session file I/O are blocking, so run
+    # the whole login flow on a worker thread
+    success, error = await asyncio.to_thread(
+        instagram_client.login, request.username, password
+    )
 
     if success:
-        return LoginResponse(
+        return ORJSONResponse(LoginResponse.from_trusted(
             success=True,
             user=instagram_client.get_current_user(),
-            message="Login successful"
-        )
+            message="Login successful",
+        ))
     else:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -177,36 +275,55 @@ async def login(request: LoginRequest):
 @app.post("/auth/logout", response_model=dict, tags=["Auth"])
 async def logout():
     """Logout and clear saved session"""
-    instagram_client.logout()
-    return {"success": True, "message": "Logged out"}
+    # Waits for any in-flight login, so keep it off the event loop
+    await asyncio.to_thread(instagram_client.logout)
+    return ORJSONResponse({"success": True, "message": "Logged out"})
 
 
 # ============================================================================
 # Direct Messages
 # ============================================================================
 
-@app.get("/inbox", response_model=InboxResponse, tags=["DM"])
-async def get_inbox(limit: int = 20):
+@app.get(
+    "/inbox",
+    response_model=Union[InboxResponse, InboxWithMessagesResponse],
+    tags=["DM"],
+)
+async def get_inbox(
+    limit: int = Query(20, ge=1, le=100),
+    with_preview_messages: int = Query(0, ge=0, le=100),
+):
     """
     Get DM inbox (list of conversations).
     
     Args:
         limit: Number of threads to fetch (default 20, max 100)
+        with_preview_messages: Include this many recent messages per thread
+            (default 0, max 100). Saves a /thread call per conversation.
     """
-    limit = min(max(limit, 1), 100)  # Clamp between 1 and 100
-    
     try:
-        threads = instagram_client.get_inbox(amount=limit)
-        return InboxResponse(success=True, threads=threads)
+        if with_preview_messages:
+            return ORJSONResponse(InboxWithMessagesResponse.from_trusted(
+                success=True,
+                threads=instagram_client.get_inbox_with_messages(
+                    amount=limit, message_limit=with_preview_messages
+                ),
+                error=None,
+            ))
+        return ORJSONResponse(InboxResponse.from_trusted(
+            success=True,
+            threads=instagram_client.get_inbox(amount=limit),
+            error=None,
+        ))
     except LoginRequired:
         raise
     except Exception as e:
         logger.error("Failed to fetch inbox: %s", e)
-        return InboxResponse(success=False, error=str(e))
+        return ORJSONResponse(InboxResponse.from_trusted(success=False, threads=(), error=str(e)))
 
 
 @app.get("/thread/{thread_id}", response_model=ThreadResponse, tags=["DM"])
-async def get_thread(thread_id: str, limit: int = 20):
+async def get_thread(thread_id: str, limit: int = Query(20, ge=1, le=100)):
     """
     Get a conversation thread with messages.
     
@@ -214,16 +331,16 @@ async def get_thread(thread_id: str, limit: int = 20):
         thread_id: Thread ID
         limit: Number of messages to fetch (default 20, max 100)
     """
-    limit = min(max(limit, 1), 100)
-    
     try:
         thread = instagram_client.get_thread(thread_id, amount=limit)
-        return ThreadResponse(success=True, thread=thread)
+        return ORJSONResponse(ThreadResponse.from_trusted(
+            success=True, thread=thread, error=None
+        ))
     except LoginRequired:
         raise
     except Exception as e:
         logger.error("Failed to fetch thread %s: %s", thread_id, e)
-        return ThreadResponse(success=False, error=str(e))
+        return ORJSONResponse(ThreadResponse.from_trusted(success=False, thread=None, error=str(e)))
 
 
 @app.post("/thread/{thread_id}/send", response_model=SendMessageResponse, tags=["DM"])
@@ -237,12 +354,16 @@ async def send_message_to_thread(thread_id: str, request: SendMessageRequest):
     """
     try:
         message = instagram_client.send_message(thread_id, request.text)
-        return SendMessageResponse(success=True, message=message)
+        return ORJSONResponse(SendMessageResponse.from_trusted(
+            success=True, message=message, error=None
+        ))
     except LoginRequired:
         raise
     except Exception as e:
         logger.error("Failed to send message to thread %s: %s", thread_id, e)
-        return SendMessageResponse(success=False, error=str(e))
+        return ORJSONResponse(SendMessageResponse.from_trusted(
+            success=False, message=None, error=str(e)
+        ))
 
 
 @app.post("/send/{username}", response_model=SendMessageResponse, tags=["DM"])
@@ -261,12 +382,16 @@ async def send_message_to_user(username: str, request: SendMessageRequest):
     
     try:
         message = instagram_client.send_message_to_user(username, request.text)
-        return SendMessageResponse(success=True, message=message)
+        return ORJSONResponse(SendMessageResponse.from_trusted(
+            success=True, message=message, error=None
+        ))
     except LoginRequired:
         raise
     except Exception as e:
         logger.error("Failed to send message to %s: %s", username, e)
-        return SendMessageResponse(success=False, error=str(e))
+        return ORJSONResponse(SendMessageResponse.from_trusted(
+            success=False, message=None, error=str(e)
+        ))
 
 
 # ============================================================================
@@ -286,7 +411,7 @@ async def search_user(username: str):
     try:
         user = instagram_client.search_user(username)
         if user:
-            return {"success": True, "user": user}
+            return ORJSONResponse({"success": True, "user": user})
         else:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -309,9 +434,17 @@ async def search_user(username: str):
 # ============================================================================
 
 if __name__ == "__main__":
+    import sys
+
     import uvicorn
     
     port = int(os.getenv("PORT", 8000))
+    workers = int(os.getenv("WORKERS", 1))
+
+    # Login state is per process: POST /auth/login would only log in the
+    # worker that happened to serve it
+    if workers > 1 and not (os.getenv("IG_USERNAME") and os.getenv("IG_PASSWORD")):
+        sys.exit("WORKERS > 1 requires IG_USERNAME and IG_PASSWORD to be set")
     
     print(f"""
 🚀 Instagram DM CLI Server
@@ -324,7 +457,7 @@ Endpoints:
   GET  /auth/public-key       - Get encryption public key
   POST /auth/login            - Login (encrypted or plain password)
   POST /auth/logout           - Logout and clear session
-  GET  /inbox                 - Get DM inbox
+  GET  /inbox                 - Get DM inbox (?with_preview_messages=N)
   GET  /thread/{{thread_id}}    - Get messages in a thread
   POST /thread/{{thread_id}}/send - Send message to thread
   POST /send/{{username}}       - Send message to user
@@ -338,6 +471,11 @@ Docs: http://localhost:{port}/docs
         "main:app",
         host="0.0.0.0",
         port=port,
-        reload=True,
+        # uvloop isn't available on Windows
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        workers=workers,
+        # uvicorn can't reload with multiple workers
+        reload=workers == 1,
         log_level="info"
     )
\ No newline at end of file
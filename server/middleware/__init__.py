@@ -1,9 +1,15 @@
 """Middleware module for encryption and security."""
 
-from .crypto import get_public_key_pem, decrypt_password, ensure_keys_exist
+from .crypto import (
+    get_public_key_pem,
+    decrypt_password,
+    decrypt_password_hybrid,
+    ensure_keys_exist,
+)
 
 __all__ = [
     "get_public_key_pem",
     "decrypt_password",
+    "decrypt_password_hybrid",
     "ensure_keys_exist",
 ]
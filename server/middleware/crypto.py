@@ -3,14 +3,31 @@ RSA encryption utilities for secure credential transmission.
 
 The CLI encrypts passwords with the server's public key before sending.
 The server decrypts using its private key.
+
+Hybrid mode: the CLI encrypts the password with a random AES-256-GCM key
+and only wraps that key with RSA-OAEP. It still costs one RSA private-key
+operation, so for a password it is slightly more work than plain RSA-OAEP;
+what it adds is no plaintext length limit and an authenticated ciphertext.
 """
 
 import base64
 import logging
+import threading
+from contextlib import contextmanager
 from pathlib import Path
+from types import ModuleType
+from typing import Iterator, Optional
+
+fcntl: Optional[ModuleType]
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
 
 from cryptography.hazmat.primitives import hashes, serialization
 from cryptography.hazmat.primitives.asymmetric import padding, rsa
+from cryptography.hazmat.primitives.asymmetric.rsa import RSAPrivateKey
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 
 logger = logging.getLogger(__name__)
 
@@ -18,16 +35,75 @@ logger = logging.getLogger(__name__)
 KEYS_DIR = Path(__file__).parent / ".keys"
 PRIVATE_KEY_PATH = KEYS_DIR / "private.pem"
 PUBLIC_KEY_PATH = KEYS_DIR / "public.pem"
+KEYS_LOCK_PATH = KEYS_DIR / ".lock"
+
+# OAEP padding (more secure than PKCS1v15), built once and reused
+_OAEP_PADDING = padding.OAEP(
+    mgf=padding.MGF1(algorithm=hashes.SHA256()),
+    algorithm=hashes.SHA256(),
+    label=None,
+)
+
+# Key material loaded once by ensure_keys_exist()
+_PRIVATE_KEY: Optional[RSAPrivateKey] = None
+_PUBLIC_KEY_PEM: Optional[str] = None
+_KEYS_READY = False
+_KEYS_LOCK = threading.Lock()
 
 
 def ensure_keys_exist() -> None:
-    """Generate RSA key pair if not already exists."""
-    if PRIVATE_KEY_PATH.exists() and PUBLIC_KEY_PATH.exists():
-        logger.debug("RSA keys already exist")
+    """Generate RSA key pair if not already exists, and load it into memory."""
+    global _PRIVATE_KEY, _PUBLIC_KEY_PEM, _KEYS_READY
+
+    # Fast path once keys are loaded - no stat calls, no lock
+    if _KEYS_READY:
         return
 
+    with _KEYS_LOCK:
+        if _KEYS_READY:
+            return
+
+        KEYS_DIR.mkdir(exist_ok=True)
+
+        # Other uvicorn workers may be starting at the same time
+        with _keys_file_lock():
+            if PRIVATE_KEY_PATH.exists() and PUBLIC_KEY_PATH.exists():
+                logger.debug("RSA keys already exist")
+            else:
+                _generate_keys()
+
+            # The key is our own, so skip the (slow) RSA consistency check
+            private_key = serialization.load_pem_private_key(
+                PRIVATE_KEY_PATH.read_bytes(),
+                password=None,
+                unsafe_skip_rsa_key_validation=True,
+            )
+            if not isinstance(private_key, RSAPrivateKey):
+                raise ValueError(f"{PRIVATE_KEY_PATH} is not an RSA private key")
+            _PRIVATE_KEY = private_key
+            _PUBLIC_KEY_PEM = PUBLIC_KEY_PATH.read_text()
+
+        _KEYS_READY = True
+
+
+@contextmanager
+def _keys_file_lock() -> Iterator[None]:
+    """Hold an exclusive lock on KEYS_LOCK_PATH across processes (no-op without fcntl)."""
+    if fcntl is None:
+        yield
+        return
+
+    with open(KEYS_LOCK_PATH, "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _generate_keys() -> None:
+    """Generate a new RSA key pair and save it to KEYS_DIR."""
     logger.info("Generating new RSA key pair...")
-    KEYS_DIR.mkdir(exist_ok=True)
 
     # Generate private key
     private_key = rsa.generate_private_key(
@@ -58,7 +134,8 @@ def ensure_keys_exist() -> None:
 def get_public_key_pem() -> str:
     """Get the public key as a PEM string for the CLI to use."""
     ensure_keys_exist()
-    return PUBLIC_KEY_PATH.read_text()
+    assert _PUBLIC_KEY_PEM is not None
+    return _PUBLIC_KEY_PEM
 
 
 def decrypt_password(encrypted_base64: str) -> str:
@@ -75,25 +152,47 @@ def decrypt_password(encrypted_base64: str) -> str:
         ValueError: If decryption fails
     """
     ensure_keys_exist()
+    assert _PRIVATE_KEY is not None
 
     try:
-        # Load private key
-        private_key = serialization.load_pem_private_key(
-            PRIVATE_KEY_PATH.read_bytes(),
-            password=None,
-        )
-
         # Decode from base64
         encrypted_data = base64.b64decode(encrypted_base64)
 
-        # Decrypt using OAEP padding (more secure than PKCS1v15)
-        decrypted = private_key.decrypt(
-            encrypted_data,
-            padding.OAEP(
-                mgf=padding.MGF1(algorithm=hashes.SHA256()),
-                algorithm=hashes.SHA256(),
-                label=None,
-            ),
+        decrypted = _PRIVATE_KEY.decrypt(encrypted_data, _OAEP_PADDING)
+
+        return decrypted.decode("utf-8")
+
+    except Exception as e:
+        logger.error("Failed to decrypt password: %s", e)
+        raise ValueError("Failed to decrypt password") from e
+
+
+def decrypt_password_hybrid(wrapped_key_b64: str, nonce_b64: str, ciphertext_b64: str) -> str:
+    """
+    Decrypt a password that was encrypted by the CLI with AES-256-GCM.
+
+    Args:
+        wrapped_key_b64: Base64-encoded AES key, encrypted with RSA-OAEP
+        nonce_b64: Base64-encoded 12-byte GCM nonce
+        ciphertext_b64: Base64-encoded ciphertext (with GCM tag appended)
+
+    Returns:
+        The decrypted password string
+
+    Raises:
+        ValueError: If decryption fails
+    """
+    ensure_keys_exist()
+    assert _PRIVATE_KEY is not None
+
+    try:
+        # Unwrap the AES key with our RSA private key
+        aes_key = _PRIVATE_KEY.decrypt(base64.b64decode(wrapped_key_b64), _OAEP_PADDING)
+
+        decrypted = AESGCM(aes_key).decrypt(
+            base64.b64decode(nonce_b64),
+            base64.b64decode(ciphertext_b64),
+            None,
         )
 
         return decrypted.decode("utf-8")
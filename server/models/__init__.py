@@ -6,7 +6,7 @@ They're designed to be simpler than instagrapi's internal models.
 """
 
 from .user_models import User, UserShort
-from .message_models import DirectMessage, DirectThread, DirectThreadPreview
+from .message_models import Reaction, DirectMessage, DirectThread, DirectThreadPreview
 from .api_models import (
     LoginRequest,
     LoginResponse,
@@ -14,16 +14,19 @@ from .api_models import (
     SendMessageRequest,
     SendMessageResponse,
     InboxResponse,
+    InboxWithMessagesResponse,
     ThreadResponse,
     HealthResponse,
     ErrorResponse,
 )
+from .encoding import encode
 
-__all__ = [
+__all__ = (
     # User models
     "User",
     "UserShort",
     # Message models
+    "Reaction",
     "DirectMessage",
     "DirectThread",
     "DirectThreadPreview",
@@ -34,7 +37,10 @@ __all__ = [
     "SendMessageRequest",
     "SendMessageResponse",
     "InboxResponse",
+    "InboxWithMessagesResponse",
     "ThreadResponse",
     "HealthResponse",
     "ErrorResponse",
-]
+    # Encoding
+    "encode",
+)
@@ -1,26 +1,38 @@
 """API request and response Pydantic models"""
 
 from typing import Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
+from .base import TrustedModel
 from .user_models import User
 from .message_models import DirectMessage, DirectThread, DirectThreadPreview
 
 
 class LoginRequest(BaseModel):
     """Login request body - supports both plain and encrypted passwords"""
+    model_config = ConfigDict(frozen=True)
+
     username: str
     password: str = Field(default="", description="Plain text password (for testing only)")
     encrypted_password: str = Field(default="", description="RSA-encrypted password (base64)")
 
+    # Hybrid encryption: AES-256-GCM password, RSA-wrapped AES key
+    wrapped_key: str = Field(default="", description="RSA-encrypted AES-256 key (base64)")
+    nonce: str = Field(default="", description="AES-GCM nonce (base64)")
+    ciphertext: str = Field(default="", description="AES-GCM encrypted password (base64)")
+
 
 class PublicKeyResponse(BaseModel):
     """Public key response for CLI encryption"""
+    model_config = ConfigDict(frozen=True, defer_build=True)
+
     public_key: str = Field(description="RSA public key in PEM format")
 
 
-class LoginResponse(BaseModel):
+class LoginResponse(TrustedModel):
     """Login response"""
+    model_config = ConfigDict(frozen=True)
+
     success: bool
     user: Optional[User] = None
     message: Optional[str] = None
@@ -28,25 +40,42 @@ class LoginResponse(BaseModel):
 
 class SendMessageRequest(BaseModel):
     """Send message request body"""
+    model_config = ConfigDict(frozen=True)
+
     text: str
 
 
-class SendMessageResponse(BaseModel):
+class SendMessageResponse(TrustedModel):
     """Send message response"""
+    model_config = ConfigDict(frozen=True)
+
     success: bool
     message: Optional[DirectMessage] = None
     error: Optional[str] = None
 
 
-class InboxResponse(BaseModel):
+class InboxResponse(TrustedModel):
     """Inbox listing response"""
+    model_config = ConfigDict(frozen=True)
+
     success: bool
-    threads: list[DirectThreadPreview] = Field(default_factory=list)
+    threads: tuple[DirectThreadPreview, ...] = ()
     error: Optional[str] = None
 
 
-class ThreadResponse(BaseModel):
+class InboxWithMessagesResponse(TrustedModel):
+    """Inbox listing response with recent messages included per thread"""
+    model_config = ConfigDict(frozen=True)
+
+    success: bool
+    threads: tuple[DirectThread, ...] = ()
+    error: Optional[str] = None
+
+
+class ThreadResponse(TrustedModel):
     """Single thread with messages response"""
+    model_config = ConfigDict(frozen=True)
+
     success: bool
     thread: Optional[DirectThread] = None
     error: Optional[str] = None
@@ -54,6 +83,8 @@ class ThreadResponse(BaseModel):
 
 class HealthResponse(BaseModel):
     """Health check response"""
+    model_config = ConfigDict(frozen=True, defer_build=True)
+
     status: str
     authenticated: bool
     username: Optional[str] = None
@@ -61,5 +92,7 @@ class HealthResponse(BaseModel):
 
 class ErrorResponse(BaseModel):
     """Error response"""
+    model_config = ConfigDict(frozen=True, defer_build=True)
+
     success: bool = False
     error: str
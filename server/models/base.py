@@ -0,0 +1,21 @@
+"""Base model for data converted from instagrapi"""
+
+from typing import Any, TypeVar
+
+from pydantic import BaseModel
+
+_ModelT = TypeVar("_ModelT", bound="TrustedModel")
+
+
+class TrustedModel(BaseModel):
+    """Model that can be built from already-typed data without validation"""
+
+    @classmethod
+    def from_trusted(cls: type[_ModelT], **fields: Any) -> _ModelT:
+        """
+        Build an instance without running validation.
+
+        Only for data we produce ourselves; callers must pass every field
+        already coerced to its declared type (e.g. pk=str(src.pk)).
+        """
+        return cls.model_construct(**fields)
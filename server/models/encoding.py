@@ -0,0 +1,12 @@
+"""JSON encoding for the API models"""
+
+from pydantic import BaseModel
+
+
+def encode(obj: BaseModel) -> bytes:
+    """Serialize a model to JSON bytes with its class's compiled serializer"""
+    cls = type(obj)
+    # defer_build models compile their serializer on first use
+    if not cls.__pydantic_complete__:
+        cls.model_rebuild()
+    return cls.__pydantic_serializer__.to_json(obj)
@@ -2,13 +2,25 @@
 
 from datetime import datetime
 from typing import Optional
-from pydantic import BaseModel, Field
+from pydantic import ConfigDict, Field
 
+from .base import TrustedModel
 from .user_models import UserShort
 
 
-class DirectMessage(BaseModel):
+class Reaction(TrustedModel):
+    """An emoji reaction on a message"""
+    model_config = ConfigDict(frozen=True)
+
+    user_id: str = Field(description="Reacting user's ID")
+    emoji: str
+    timestamp: datetime
+
+
+class DirectMessage(TrustedModel):
     """A single direct message"""
+    model_config = ConfigDict(frozen=True)
+
     id: str = Field(description="Message ID")
     user_id: Optional[str] = Field(default=None, description="Sender's user ID")
     timestamp: datetime
@@ -23,37 +35,36 @@ class DirectMessage(BaseModel):
     link_title: Optional[str] = None
 
     # Reactions
-    reactions: Optional[list[dict]] = None
+    reactions: tuple[Reaction, ...] = ()
 
 
-class DirectThread(BaseModel):
-    """A DM conversation thread"""
+class _ThreadBase(TrustedModel):
+    """Fields shared by full threads and inbox previews"""
+    model_config = ConfigDict(frozen=True)
+
     id: str = Field(description="Thread ID")
     pk: str = Field(description="Thread primary key")
     thread_title: str = Field(default="", description="Thread name (for groups) or username")
-    users: list[UserShort] = Field(default_factory=list, description="Participants")
+    users: tuple[UserShort, ...] = Field(default=(), description="Participants")
     last_activity_at: Optional[datetime] = None
     is_group: bool = False
     is_muted: bool = False
     has_unread: bool = False
 
+
+class DirectThread(_ThreadBase):
+    """A DM conversation thread"""
+
     # Last message preview
     last_message: Optional[DirectMessage] = None
 
     # Messages (only populated when fetching single thread)
-    messages: list[DirectMessage] = Field(default_factory=list)
+    messages: tuple[DirectMessage, ...] = ()
 
 
-class DirectThreadPreview(BaseModel):
+class DirectThreadPreview(_ThreadBase):
     """Inbox thread preview (without full messages)"""
-    id: str
-    pk: str
-    thread_title: str = ""
-    users: list[UserShort] = Field(default_factory=list)
-    last_activity_at: Optional[datetime] = None
-    is_group: bool = False
-    is_muted: bool = False
-    has_unread: bool = False
+
     last_message_text: Optional[str] = None
     last_message_type: Optional[str] = None
     last_message_timestamp: Optional[datetime] = None
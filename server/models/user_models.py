@@ -1,22 +1,27 @@
 """User-related Pydantic models"""
 
-from typing import Optional
-from pydantic import BaseModel, Field
+from pydantic import ConfigDict, Field
 
+from .base import TrustedModel
 
-class User(BaseModel):
+
+class User(TrustedModel):
     """Simplified user model"""
+    model_config = ConfigDict(frozen=True)
+
     pk: str = Field(description="User's primary key (ID)")
     username: str
     full_name: str = ""
-    profile_pic_url: Optional[str] = None
+    profile_pic_url: str = ""
     is_private: bool = False
     is_verified: bool = False
 
 
-class UserShort(BaseModel):
+class UserShort(TrustedModel):
     """Minimal user info for thread listings"""
+    model_config = ConfigDict(frozen=True)
+
     pk: str
     username: str
     full_name: str = ""
-    profile_pic_url: Optional[str] = None
+    profile_pic_url: str = ""
@@ -0,0 +1,41 @@
+"""
+Response classes for the API.
+
+ORJSONResponse serializes with orjson instead of the stdlib json module.
+Pydantic models can be passed in as content directly: they are encoded by
+their compiled pydantic-core serializer (models.encode) straight to JSON
+bytes, without building an intermediate dict. Plain dicts/lists go through
+orjson, with any models inside them embedded as pre-encoded fragments.
+
+Datetimes are encoded natively by both encoders (never via Python-level
+isoformat()), and kept as ISO 8601 strings because the CLI parses them as
+such. OPT_UTC_Z makes orjson write UTC as "Z", matching pydantic-core.
+"""
+
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from models import encode
+
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+
+
+def _default(obj: Any) -> Any:
+    """Fallback for types orjson doesn't know about"""
+    if isinstance(obj, BaseModel):
+        return orjson.Fragment(encode(obj))
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson (or pydantic-core for models)"""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return encode(content)
+        return orjson.dumps(content, default=_default, option=_ORJSON_OPTIONS)
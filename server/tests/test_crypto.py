@@ -0,0 +1,62 @@
+"""Round-trip tests for the password encryption helpers"""
+
+import base64
+import os
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+from middleware import crypto
+
+
+@pytest.fixture
+def public_key(tmp_path, monkeypatch):
+    """Fresh key pair in a temp dir, with the module's cached keys reset"""
+    monkeypatch.setattr(crypto, "KEYS_DIR", tmp_path)
+    monkeypatch.setattr(crypto, "PRIVATE_KEY_PATH", tmp_path / "private.pem")
+    monkeypatch.setattr(crypto, "PUBLIC_KEY_PATH", tmp_path / "public.pem")
+    monkeypatch.setattr(crypto, "KEYS_LOCK_PATH", tmp_path / ".lock")
+    monkeypatch.setattr(crypto, "_PRIVATE_KEY", None)
+    monkeypatch.setattr(crypto, "_PUBLIC_KEY_PEM", None)
+    monkeypatch.setattr(crypto, "_KEYS_READY", False)
+    return serialization.load_pem_public_key(crypto.get_public_key_pem().encode())
+
+
+def _b64(data: bytes) -> str:
+    return base64.b64encode(data).decode()
+
+
+def _hybrid_encrypt(public_key, password: str) -> tuple[str, str, str]:
+    """Encrypt the way a client does for the hybrid login fields"""
+    aes_key = AESGCM.generate_key(bit_length=256)
+    nonce = os.urandom(12)
+    ciphertext = AESGCM(aes_key).encrypt(nonce, password.encode(), None)
+    wrapped_key = public_key.encrypt(aes_key, crypto._OAEP_PADDING)
+    return _b64(wrapped_key), _b64(nonce), _b64(ciphertext)
+
+
+def test_decrypt_password_round_trip(public_key):
+    encrypted = public_key.encrypt("hunter2".encode(), crypto._OAEP_PADDING)
+    assert crypto.decrypt_password(_b64(encrypted)) == "hunter2"
+
+
+def test_decrypt_password_hybrid_round_trip(public_key):
+    fields = _hybrid_encrypt(public_key, "pässwörd with spaces")
+    assert crypto.decrypt_password_hybrid(*fields) == "pässwörd with spaces"
+
+
+def test_decrypt_password_hybrid_rejects_tampered_ciphertext(public_key):
+    wrapped_key, nonce, ciphertext = _hybrid_encrypt(public_key, "hunter2")
+    tampered = bytearray(base64.b64decode(ciphertext))
+    tampered[0] ^= 1
+
+    with pytest.raises(ValueError):
+        crypto.decrypt_password_hybrid(wrapped_key, nonce, _b64(bytes(tampered)))
+
+
+def test_decrypt_password_hybrid_rejects_wrong_nonce(public_key):
+    wrapped_key, _, ciphertext = _hybrid_encrypt(public_key, "hunter2")
+
+    with pytest.raises(ValueError):
+        crypto.decrypt_password_hybrid(wrapped_key, _b64(os.urandom(12)), ciphertext)
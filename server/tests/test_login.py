@@ -0,0 +1,45 @@
+"""Request validation tests for POST /auth/login"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+
+
+@pytest.fixture
+def client():
+    # No context manager: skip the lifespan (key generation, env auto-login)
+    return TestClient(main.app)
+
+
+def test_login_rejects_non_json_content_type(client):
+    response = client.post(
+        "/auth/login",
+        content='{"username": "x", "password": "hunter2"}',
+        headers={"Content-Type": "text/plain"},
+    )
+
+    assert response.status_code == 422
+    assert "hunter2" not in response.text
+
+
+def test_login_malformed_json_does_not_echo_body(client):
+    response = client.post(
+        "/auth/login",
+        content='{"username": "x", "password": "hunter2",}',
+        headers={"Content-Type": "application/json"},
+    )
+
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["type"] == "json_invalid"
+    assert "hunter2" not in response.text
+
+
+def test_login_missing_username(client):
+    response = client.post("/auth/login", json={"password": "hunter2"})
+
+    assert response.status_code == 422
+    error = response.json()["detail"][0]
+    assert error["type"] == "missing"
+    assert error["loc"] == ["body", "username"]
+    assert "hunter2" not in response.text
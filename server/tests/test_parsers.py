@@ -0,0 +1,35 @@
+"""Tests for converting instagrapi types to our models"""
+
+from datetime import datetime
+
+from instagrapi.types import DirectThread as IGDirectThread, UserShort as IGUserShort
+
+from instagram.parsers import parse_thread, parse_thread_preview, parse_user_short
+from models import encode
+
+
+def _thread(users):
+    return IGDirectThread.model_construct(
+        pk="p1",
+        id="t1",
+        messages=[],
+        users=users,
+        last_activity_at=datetime(2026, 1, 1),
+        muted=False,
+        thread_title="",
+        is_group=len(users) > 1,
+    )
+
+
+def test_parse_user_short_without_username():
+    user = parse_user_short(IGUserShort(pk="5", username=None))
+
+    assert user.username == ""
+    assert b'"username":""' in encode(user)
+
+
+def test_thread_title_skips_missing_usernames():
+    users = [IGUserShort(pk="5", username=None), IGUserShort(pk="6", username="bob")]
+
+    assert parse_thread(_thread(users)).thread_title == "bob"
+    assert parse_thread_preview(_thread(users)).thread_title == "bob"